@@ -27,12 +27,15 @@
 
 import re
 
+# Characters not allowed in catalog/schema names derived from the username
+USERNAME_INVALID_CHARS = re.compile(r'[^a-z0-9]')
+
 # Get current user information
-current_user = spark.sql("SELECT current_user()").collect()[0][0]
+current_user = spark.sql("SELECT current_user()").first()[0]
 username = current_user.split("@")[0]
 
 # Clean username for use in naming (remove special characters)
-clean_username = re.sub(r'[^a-z0-9]', '_', username.lower())
+clean_username = USERNAME_INVALID_CHARS.sub('_', username.lower())
 
 # Create a helper class
 class WorkshopHelper:
@@ -49,6 +52,10 @@ class WorkshopHelper:
         self.bronze_schema = f"{clean_username}_bronze"
         self.silver_schema = f"{clean_username}_silver"
         self.gold_schema = f"{clean_username}_gold"
+        
+        # Sample data file format: "json" (default) or "parquet".
+        # The pipelines read it from the file_format configuration variable printed in Step 10.
+        self.file_format = "json"
     
     def print_config(self):
         print(f"""
@@ -57,6 +64,7 @@ Workshop Configuration
 User: {self.username}
 Catalog: {self.catalog_name}
 Working Directory: {self.working_dir}
+Sample File Format: {self.file_format}
 
 Schemas:
 - Bronze: {self.catalog_name}.{self.bronze_schema}
@@ -91,20 +99,32 @@ print(f"\nStarting fresh setup for: {DA.catalog_name}")
 
 # COMMAND ----------
 
+from concurrent.futures import ThreadPoolExecutor
+from databricks.sdk import WorkspaceClient
+from databricks.sdk.errors import AlreadyExists, ResourceAlreadyExists
+from databricks.sdk.service.catalog import VolumeType
+
 # Create the catalog first
 spark.sql(f"CREATE CATALOG IF NOT EXISTS {DA.catalog_name}")
 print(f"✓ Created catalog: {DA.catalog_name}")
 
-# Create the default schema for volumes
-spark.sql(f"CREATE SCHEMA IF NOT EXISTS {DA.catalog_name}.{DA.default_schema}")
-print(f"✓ Created schema: {DA.catalog_name}.{DA.default_schema}")
+# Unity Catalog REST client - creates schemas and volumes without a round trip through Spark SQL
+workspace_client = WorkspaceClient()
 
-# Create the three schemas for medallion architecture
-schemas_to_create = [DA.bronze_schema, DA.silver_schema, DA.gold_schema]
+# Create the default schema (for volumes) and the three medallion schemas.
+# Once the catalog exists the schemas are independent, so create them in parallel.
+schemas_to_create = [DA.default_schema, DA.bronze_schema, DA.silver_schema, DA.gold_schema]
 
-for schema in schemas_to_create:
-    spark.sql(f"CREATE SCHEMA IF NOT EXISTS {DA.catalog_name}.{schema}")
-    print(f"✓ Created schema: {DA.catalog_name}.{schema}")
+def create_schema(schema):
+    try:
+        workspace_client.schemas.create(name=schema, catalog_name=DA.catalog_name)
+    except (AlreadyExists, ResourceAlreadyExists):
+        pass  # Same as CREATE SCHEMA IF NOT EXISTS
+    return schema
+
+with ThreadPoolExecutor(max_workers=len(schemas_to_create)) as executor:
+    for schema in executor.map(create_schema, schemas_to_create):
+        print(f"✓ Created schema: {DA.catalog_name}.{schema}")
 
 # COMMAND ----------
 
@@ -115,7 +135,15 @@ for schema in schemas_to_create:
 
 # Create volume in the default schema for raw source files
 volume_name = "raw"
-spark.sql(f"CREATE VOLUME IF NOT EXISTS {DA.catalog_name}.{DA.default_schema}.{volume_name}")
+try:
+    workspace_client.volumes.create(
+        catalog_name=DA.catalog_name,
+        schema_name=DA.default_schema,
+        name=volume_name,
+        volume_type=VolumeType.MANAGED,
+    )
+except (AlreadyExists, ResourceAlreadyExists):
+    pass  # Same as CREATE VOLUME IF NOT EXISTS
 print(f"✓ Created volume: {DA.catalog_name}.{DA.default_schema}.{volume_name}")
 print(f"  Path: {DA.working_dir}")
 
@@ -126,91 +154,77 @@ print(f"  Path: {DA.working_dir}")
 
 # COMMAND ----------
 
-# Create directories for source data
-dbutils.fs.mkdirs(f"{DA.working_dir}/orders")
-dbutils.fs.mkdirs(f"{DA.working_dir}/status")
-dbutils.fs.mkdirs(f"{DA.working_dir}/customers")
+# Create directories for source data (in parallel - each mkdirs is a separate round trip)
+source_dirs = [f"{DA.working_dir}/{name}" for name in ("orders", "status", "customers")]
+
+with ThreadPoolExecutor(max_workers=len(source_dirs)) as executor:
+    list(executor.map(dbutils.fs.mkdirs, source_dirs))
 
 print("✓ Created raw source data directories:")
-print(f"  - {DA.working_dir}/orders")
-print(f"  - {DA.working_dir}/status")
-print(f"  - {DA.working_dir}/customers")
+for source_dir in source_dirs:
+    print(f"  - {source_dir}")
 
 # COMMAND ----------
 
 # MAGIC %md
-# MAGIC ## Step 6: Generate Sample Orders Data
+# MAGIC ## Step 6: Load Sample Data Helpers
+# MAGIC
+# MAGIC Orders are generated with `add_orders_file` from `utilities/utils.py` - the same helper Lesson 1 uses to add more order files.
+# MAGIC
+# MAGIC **Note:** Run this notebook from its folder in the workspace (next to `utilities/`) so `utilities.utils` can be imported.
 
 # COMMAND ----------
 
-import json
-from datetime import datetime, timedelta
-import random
+import os
+import sys
+from datetime import datetime
+import numpy as np
 
-# Generate sample orders
-def generate_orders(num_orders=174, file_name="00.json"):
-    """Generate sample orders data"""
-    orders = []
-    base_date = datetime(2024, 1, 1)
-    
-    for i in range(num_orders):
-        order = {
-            "order_id": f"ORD{i+1000:05d}",
-            "order_timestamp": (base_date + timedelta(days=random.randint(0, 30))).isoformat(),
-            "customer_id": f"CUST{random.randint(1, 100):04d}",
-            "notifications": {
-                "email": random.choice([True, False]),
-                "sms": random.choice([True, False])
-            }
-        }
-        orders.append(order)
-    
-    # Write to volume
-    file_path = f"{DA.working_dir}/orders/{file_name}"
-    dbutils.fs.put(file_path, "\n".join([json.dumps(order) for order in orders]), overwrite=True)
-    
-    return len(orders)
+# Make the utilities package importable (one level up from this notebook)
+utilities_root = os.path.dirname(os.getcwd())
+if utilities_root not in sys.path:
+    sys.path.append(utilities_root)
+from utilities.utils import add_orders_file, iter_blocks, write_records
 
-# Generate initial orders file
-num_orders = generate_orders(num_orders=174, file_name="00.json")
-print(f"✓ Generated {num_orders} sample orders in 00.json")
+# Draw sample values a column at a time instead of row by row
+rng = np.random.default_rng()
 
 # COMMAND ----------
 
 # MAGIC %md
-# MAGIC ## Step 7: Generate Sample Status Data
+# MAGIC ## Step 7: Define Sample Status Generator
 
 # COMMAND ----------
 
 def generate_status_updates(num_updates=536, file_name="00.json"):
     """Generate sample order status updates"""
     statuses = ['placed', 'preparing', 'on the way', 'delivered', 'canceled']
-    status_updates = []
     
     base_timestamp = datetime(2024, 1, 1).timestamp()
     
-    for i in range(num_updates):
-        update = {
-            "order_id": f"ORD{random.randint(1000, 1173):05d}",
-            "order_status": random.choice(statuses),
-            "status_timestamp": base_timestamp + (i * 3600)  # Unix timestamp
-        }
-        status_updates.append(update)
+    def status_updates():
+        # Draw the columns one block at a time so large files don't need every row in memory
+        for start, size in iter_blocks(num_updates):
+            order_numbers = rng.integers(1000, 1174, size=size).tolist()
+            order_statuses = rng.choice(statuses, size=size).tolist()
+            status_timestamps = (base_timestamp + np.arange(start, start + size) * 3600).tolist()  # Unix timestamps, one hour apart
+            for order_number, order_status, status_timestamp in zip(order_numbers, order_statuses, status_timestamps):
+                yield {
+                    "order_id": f"ORD{order_number:05d}",
+                    "order_status": order_status,
+                    "status_timestamp": status_timestamp
+                }
     
     # Write to volume
     file_path = f"{DA.working_dir}/status/{file_name}"
-    dbutils.fs.put(file_path, "\n".join([json.dumps(update) for update in status_updates]), overwrite=True)
+    write_records(file_path, status_updates(), DA.file_format)
     
-    return len(status_updates)
-
-# Generate initial status file
-num_status = generate_status_updates(num_updates=536, file_name="00.json")
-print(f"✓ Generated {num_status} sample status updates in 00.json")
+    return num_updates
 
 # COMMAND ----------
 
 # MAGIC %md
-# MAGIC ## Step 8: Generate Sample Customer CDC Data
+# MAGIC ## Step 8: Define Sample Customer CDC Generator
 
 # COMMAND ----------
 
@@ -220,14 +234,16 @@ def generate_customer_cdc(file_name="00.json"):
     base_timestamp = datetime(2024, 1, 1).timestamp()
     
     # INSERT operations - 20 new customers
-    for i in range(1, 21):
+    cities = rng.choice(["New York", "Los Angeles", "Chicago", "Houston"], size=20).tolist()
+    states = rng.choice(["NY", "CA", "IL", "TX"], size=20).tolist()
+    for i, city, state in zip(range(1, 21), cities, states):
         customer = {
             "customer_id": f"CUST{i:04d}",
             "name": f"Customer {i}",
             "email": f"customer{i}@example.com",
             "address": f"{i*100} Main St",
-            "city": random.choice(["New York", "Los Angeles", "Chicago", "Houston"]),
-            "state": random.choice(["NY", "CA", "IL", "TX"]),
+            "city": city,
+            "state": state,
             "zip_code": f"{10000 + i:05d}",
             "operation": "INSERT",
             "timestamp": base_timestamp + (i * 1000)
@@ -260,13 +276,30 @@ def generate_customer_cdc(file_name="00.json"):
     
     # Write to volume
     file_path = f"{DA.working_dir}/customers/{file_name}"
-    dbutils.fs.put(file_path, "\n".join([json.dumps(c) for c in customers]), overwrite=True)
+    write_records(file_path, customers, DA.file_format)
     
     return len(customers)
 
-# Generate initial customer CDC file
-num_customers = generate_customer_cdc(file_name="00.json")
-print(f"✓ Generated {num_customers} customer CDC events in 00.json")
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## Step 9: Generate Sample Data Files
+
+# COMMAND ----------
+
+sample_file_name = f"00.{DA.file_format}"
+
+# The three datasets are independent, so generate and write them concurrently
+with ThreadPoolExecutor(max_workers=3) as executor:
+    orders_future = executor.submit(
+        add_orders_file, spark, DA.working_dir, file_number=0, num_orders=174, file_format=DA.file_format
+    )
+    status_future = executor.submit(generate_status_updates, num_updates=536, file_name=sample_file_name)
+    customers_future = executor.submit(generate_customer_cdc, file_name=sample_file_name)
+
+print(f"✓ {orders_future.result()}")
+print(f"✓ Generated {status_future.result()} sample status updates in {sample_file_name}")
+print(f"✓ Generated {customers_future.result()} customer CDC events in {sample_file_name}")
 print(f"  - 20 INSERT operations")
 print(f"  - 5 UPDATE operations")
 print(f"  - 2 DELETE operations")
@@ -274,7 +307,7 @@ print(f"  - 2 DELETE operations")
 # COMMAND ----------
 
 # MAGIC %md
-# MAGIC ## Step 9: Setup Complete!
+# MAGIC ## Step 10: Setup Complete!
 
 # COMMAND ----------
 
@@ -290,10 +323,13 @@ IMPORTANT: Save these values for your pipeline settings:
 
 1. Default Catalog: {catalog}
 2. Default Schema: bronze
-3. Configuration Variable:
+3. Configuration Variables:
      Key: source
      Value: {working_dir}
 
+     Key: file_format
+     Value: {DA.file_format}
+
 Raw data landing zone:
   {working_dir}
 
@@ -303,9 +339,10 @@ Schemas created:
   • {catalog}.gold
 
 Sample raw data created:
-  • 174 orders in orders/00.json
-  • 536 status updates in status/00.json
-  • 27 customer CDC events in customers/00.json
+  • 174 orders in orders/{sample_file_name}
+  • 536 status updates in status/{sample_file_name}
+  • 27 customer CDC events in customers/{sample_file_name}
+  (their schemas are declared in the pipeline SQL via read_files(schema => ...))
 
 --------------------------------------------------------------------------------
 Next Steps:
@@ -175,9 +175,9 @@
 -- MAGIC 2. Ensure **Serverless** is selected (recommended)
 -- MAGIC 3. If not available, classic compute will work but takes longer to start
 -- MAGIC
--- MAGIC ### Step 6: Add Configuration Variable ⚠️ IMPORTANT
+-- MAGIC ### Step 6: Add Configuration Variables ⚠️ IMPORTANT
 -- MAGIC
--- MAGIC This is critical - the SQL code references a `${source}` variable:
+-- MAGIC This is critical - the SQL code references `${source}` and `${file_format}` variables:
 -- MAGIC
 -- MAGIC 1. In the **Configuration** section, click **Add configuration**
 -- MAGIC 2. **Key**: `source`
@@ -185,7 +185,10 @@
 -- MAGIC    - Format: `/Volumes/{your-catalog}/default/raw`
 -- MAGIC    - Example: `/Volumes/sdp_workshop_john_doe/default/raw`
 -- MAGIC    - If you don't remember: Go back to the 0-SETUP output to see it
--- MAGIC 4. Click **Save**
+-- MAGIC 4. Click **Add configuration** again
+-- MAGIC 5. **Key**: `file_format`
+-- MAGIC 6. **Value**: `json` (or the value shown in the 0-SETUP output)
+-- MAGIC 7. Click **Save**
 -- MAGIC
 -- MAGIC ### Step 7: Save Settings
 -- MAGIC
@@ -209,13 +212,14 @@
 -- MAGIC   TBLPROPERTIES ("pipelines.reset.allowed" = false)
 -- MAGIC AS 
 -- MAGIC SELECT *, current_timestamp() AS processing_time, ...
--- MAGIC FROM STREAM read_files("${source}/orders", format => 'json');
+-- MAGIC FROM STREAM read_files("${source}/orders", format => '${file_format}', schema => '...', ...);
 -- MAGIC ```
 -- MAGIC
 -- MAGIC **Key Concepts**:
 -- MAGIC - `CREATE OR REFRESH STREAMING TABLE`: Defines an incrementally updated table
 -- MAGIC - `STREAM read_files()`: Auto Loader - incrementally processes new files
--- MAGIC - `${source}`: Variable substitution from pipeline configuration
+-- MAGIC - `schema => '...'`: Declares the file schema up front so Auto Loader doesn't have to sample files to infer it
+-- MAGIC - `${source}`, `${file_format}`: Variable substitution from pipeline configuration
 -- MAGIC - `pipelines.reset.allowed = false`: Prevents accidental full refresh
 -- MAGIC - Checkpoint is managed automatically
 -- MAGIC - Inherit default catalog and schema names or write out to different catalogs and schemas using the fully qualified name 
@@ -284,9 +288,9 @@
 -- MAGIC
 -- MAGIC ### Troubleshooting Dry Run Errors:
 -- MAGIC
--- MAGIC **Error: "Variable 'source' not found"**
+-- MAGIC **Error: "Variable 'source' not found"** (or `'file_format'`)
 -- MAGIC - Go back to Settings → Configuration
--- MAGIC - Verify the `source` variable is set correctly
+-- MAGIC - Verify the `source` and `file_format` variables are set correctly
 -- MAGIC
 -- MAGIC **Error: "Schema not found"**
 -- MAGIC - Check that 0-SETUP.py ran successfully
@@ -415,7 +419,7 @@
 -- MAGIC from utilities.utils import add_orders_file   # or utilities.utils if that's your filename
 -- MAGIC
 -- MAGIC # Get current user information
--- MAGIC current_user = spark.sql("SELECT current_user()").collect()[0][0]
+-- MAGIC current_user = spark.sql("SELECT current_user()").first()[0]
 -- MAGIC username = current_user.split("@")[0]
 -- MAGIC
 -- MAGIC # Clean username for use in naming (remove special characters)
@@ -423,7 +427,8 @@
 -- MAGIC
 -- MAGIC working_dir = f'/Volumes/xxx/{clean_username}_default/raw'
 -- MAGIC
--- MAGIC result = add_orders_file(spark, working_dir, file_number=1, num_orders=25)
+-- MAGIC # file_format must match the pipeline's file_format configuration value ("json" by default)
+-- MAGIC result = add_orders_file(spark, working_dir, file_number=1, num_orders=25, file_format="json")
 -- MAGIC print(result)
 
 -- COMMAND ----------
@@ -458,7 +463,7 @@
 -- MAGIC %py
 -- MAGIC # Set catalog for SQL queries in this notebook
 -- MAGIC import re
--- MAGIC current_user = spark.sql("SELECT current_user()").collect()[0][0]
+-- MAGIC current_user = spark.sql("SELECT current_user()").first()[0]
 -- MAGIC username = current_user.split("@")[0]
 -- MAGIC clean_username = re.sub(r'[^a-z0-9]', '_', username.lower())
 -- MAGIC catalog_name = f"sdp_workshop_{clean_username}"
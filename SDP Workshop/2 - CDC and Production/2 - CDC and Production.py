@@ -142,7 +142,7 @@
 # MAGIC CREATE OR REFRESH STREAMING TABLE bronze.customers_raw
 # MAGIC AS 
 # MAGIC SELECT *, current_timestamp() AS processing_time
-# MAGIC FROM STREAM read_files("${source}/customers", format => 'json');
+# MAGIC FROM STREAM read_files("${source}/customers", format => '${file_format}', schema => '...', ...);
 # MAGIC ```
 # MAGIC
 # MAGIC **What it does:**
@@ -339,7 +339,7 @@
 # MAGIC %py
 # MAGIC # Set catalog for SQL queries in this notebook
 # MAGIC import re
-# MAGIC current_user = spark.sql("SELECT current_user()").collect()[0][0]
+# MAGIC current_user = spark.sql("SELECT current_user()").first()[0]
 # MAGIC username = current_user.split("@")[0]
 # MAGIC clean_username = re.sub(r'[^a-z0-9]', '_', username.lower())
 # MAGIC catalog_name = f"sdp_workshop_{clean_username}"
@@ -490,7 +490,7 @@
 # Uncomment the lines below to cleanup all workshop resources
 
 # import re
-# current_user = spark.sql("SELECT current_user()").collect()[0][0]
+# current_user = spark.sql("SELECT current_user()").first()[0]
 # username = current_user.split("@")[0]
 # clean_username = re.sub(r'[^a-z0-9]', '_', username.lower())
 # catalog_name = f"sdp_workshop_{clean_username}"
@@ -31,7 +31,10 @@ SELECT
   _metadata.file_name AS source_file
 FROM STREAM read_files(
   "${source}/customers",
-  format => 'json'
+  format => '${file_format}',  -- Uses the 'file_format' configuration variable (json or parquet)
+  -- Declaring the schema skips Auto Loader's file sampling and schema inference
+  schema => 'customer_id STRING, name STRING, email STRING, address STRING, city STRING, state STRING, zip_code STRING, operation STRING, timestamp DOUBLE',
+  rescuedDataColumn => '_rescued_data'  -- Keep values that don't match the schema
 );
 
 -------------------------------------------------------
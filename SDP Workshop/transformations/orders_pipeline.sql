@@ -27,7 +27,10 @@ SELECT
   _metadata.file_name AS source_file
 FROM STREAM read_files( -- Incrementally process new files with Auto Loader
   "${source}/orders",  -- Uses the 'source' configuration variable from pipeline settings
-  format => 'json'
+  format => '${file_format}',  -- Uses the 'file_format' configuration variable (json or parquet)
+  -- Declaring the schema skips Auto Loader's file sampling and schema inference
+  schema => 'order_id STRING, order_timestamp STRING, customer_id STRING, notifications STRUCT<email: BOOLEAN, sms: BOOLEAN>',
+  rescuedDataColumn => '_rescued_data'  -- Keep values that don't match the schema
 );
 
 -------------------------------------------------------
@@ -79,4 +82,5 @@ GROUP BY date(order_timestamp);
 -- 3. Variable substitution: ${source} is replaced at runtime
 -- 4. Streaming tables use checkpoints for incremental processing
 -- 5. Materialized views handle full refreshes efficiently
+-- 6. An explicit schema avoids schema inference on the first run
 -------------------------------------------------------
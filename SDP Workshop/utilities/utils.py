@@ -1,27 +1,113 @@
 # utilities/add_helpers.py
 
-from pyspark.dbutils import DBUtils
-from datetime import datetime, timedelta
-import random
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import json
+from itertools import islice
 
-def add_orders_file(spark, working_dir: str, file_number: int, num_orders: int) -> str:
-    """
-    Create a JSON file under {working_dir}/orders/{NN}.json
-    with num_orders synthetic orders.
-    """
-    dbutils = DBUtils(spark)
-    base_date = datetime(2024, 1, 1)
-    orders = []
-    for i in range(num_orders):
-        orders.append({
-            "order_id": f"ORD{i + 1000 + file_number * 1000:05d}",
-            "order_timestamp": (base_date + timedelta(days=random.randint(0, 30))).isoformat(),
-            "customer_id": f"CUST{random.randint(1, 100):04d}",
-            "notifications": {"email": random.choice([True, False]),
-                              "sms": random.choice([True, False])}
-        })
-    file_name = f"{file_number:02d}.json"
+# orjson serializes records much faster than the stdlib encoder; fall back if it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Reuse one compact encoder (no whitespace after separators) to match orjson's output
+_to_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+# Sample data file formats supported by write_records (and read_files in the pipelines)
+FILE_FORMATS = ("json", "parquet")
+
+# Rows generated (and, for Parquet, written) per block, so memory stays bounded however large the file
+BLOCK_SIZE = 64 * 1024
+
+def iter_blocks(num_rows: int, block_size: int = BLOCK_SIZE):
+    """
+    Yield (start, size) for consecutive blocks of at most block_size rows covering num_rows rows.
+    """
+    for start in range(0, num_rows, block_size):
+        yield start, min(block_size, num_rows - start)
+
+# Precomputed order timestamps (one per day of January 2024) and customer IDs,
+# indexed by the random draws so nothing is formatted per row
+_ORDER_TIMESTAMPS = np.datetime_as_string(
+    np.datetime64("2024-01-01T00:00:00") + np.arange(31).astype("timedelta64[D]"), unit="s"
+)
+_CUSTOMER_IDS = np.array([f"CUST{c:04d}" for c in range(1, 101)])
+
+# Sample files are written from the driver rather than with spark.write.json: the exercises rely on
+# each batch landing as one predictably named file (00.json, 01.json, ...), while the DataFrame
+# writer produces part-* files plus commit markers, and these datasets are only a few hundred rows
+def write_records(file_path: str, records, file_format: str = "json") -> None:
+    """
+    Write records (any iterable of dicts) to file_path as newline-delimited JSON
+    (file_format="json") or a snappy-compressed Parquet file (file_format="parquet").
+    """
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"file_format must be one of {FILE_FORMATS}, got {file_format!r}")
+    # /Volumes paths are mounted on the driver, so write the file directly instead of via dbutils.fs.put
+    if file_format == "parquet":
+        _write_parquet(file_path, records)
+    elif orjson is not None:
+        # orjson already returns UTF-8 bytes, so write them without a decode/encode round trip
+        with open(file_path, "wb", buffering=1 << 20) as f:
+            for record in records:
+                f.write(orjson.dumps(record))
+                f.write(b"\n")
+    else:
+        with open(file_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            for record in records:
+                f.write(_to_json(record))
+                f.write("\n")
+
+def _write_parquet(file_path: str, records) -> None:
+    """
+    Write records to a snappy-compressed Parquet file one row group per block,
+    using the schema of the first block for the whole file.
+    """
+    records = iter(records)
+    batch = list(islice(records, BLOCK_SIZE))
+    if not batch:
+        pd.DataFrame().to_parquet(file_path, compression="snappy", index=False)
+        return
+    table = pa.Table.from_pandas(pd.DataFrame(batch), preserve_index=False)
+    with pq.ParquetWriter(file_path, table.schema, compression="snappy") as writer:
+        while batch:
+            # Later blocks may lack optional keys entirely, so align them to the first block's columns
+            block = pd.DataFrame(batch).reindex(columns=table.schema.names)
+            writer.write_table(pa.Table.from_pandas(block, schema=table.schema, preserve_index=False))
+            batch = list(islice(records, BLOCK_SIZE))
+
+def _generate_orders(first_id: int, num_orders: int):
+    """
+    Yield num_orders synthetic orders with IDs starting at first_id, drawing the
+    random columns one block at a time.
+    """
+    rng = np.random.default_rng()
+    for start, size in iter_blocks(num_orders):
+        order_timestamps = _ORDER_TIMESTAMPS[rng.integers(0, 31, size=size)].tolist()
+        customer_ids = _CUSTOMER_IDS[rng.integers(0, 100, size=size)].tolist()
+        # One 2-bit draw per order: bit 0 is the email flag, bit 1 the sms flag
+        notification_bits = rng.integers(0, 4, size=size, dtype=np.uint8)
+        email_flags = (notification_bits & 1).astype(bool).tolist()
+        sms_flags = (notification_bits & 2).astype(bool).tolist()
+        for n, order_timestamp, customer_id, email, sms in zip(
+                range(first_id + start, first_id + start + size),
+                order_timestamps, customer_ids, email_flags, sms_flags):
+            yield {"order_id": f"ORD{n:05d}",
+                   "order_timestamp": order_timestamp,
+                   "customer_id": customer_id,
+                   "notifications": {"email": email, "sms": sms}}
+
+def add_orders_file(spark, working_dir: str, file_number: int, num_orders: int,
+                    file_format: str = "json") -> str:
+    """
+    Create a file under {working_dir}/orders/{NN}.{file_format}
+    with num_orders synthetic orders. file_format is "json" or "parquet".
+    """
+    orders = _generate_orders(1000 + file_number * 1000, num_orders)
+    file_name = f"{file_number:02d}.{file_format}"
     file_path = f"{working_dir}/orders/{file_name}"
-    dbutils.fs.put(file_path, "\n".join(json.dumps(o) for o in orders), True)
+    write_records(file_path, orders, file_format)
     return f"Created {num_orders} orders in orders/{file_name}"
\ No newline at end of file